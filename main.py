@@ -13,9 +13,9 @@ import shutil
 import subprocess
 import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 # ============================================================================
@@ -23,25 +23,33 @@ from typing import Dict, List, Optional
 # ============================================================================
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BuildConfig:
     """Build configuration options"""
 
-    features: List[str] = None
+    features: List[str] = field(default_factory=list)
     target: Optional[str] = None
-    cargo_flags: List[str] = None
-    env: Dict[str, str] = None
+    cargo_flags: List[str] = field(default_factory=list)
+    env: Dict[str, str] = field(default_factory=dict)
+    # Arguments for cargo build derived from the fields above; slots rule out
+    # cached_property, so it is computed once here instead
+    cargo_argv: Tuple[str, ...] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        if self.features is None:
-            self.features = []
-        if self.cargo_flags is None:
-            self.cargo_flags = []
-        if self.env is None:
-            self.env = {}
+        argv = []
+        if self.features:
+            argv += ["--features", ",".join(self.features)]
+        if self.target:
+            argv += ["--target", self.target]
+        argv += self.cargo_flags
+        object.__setattr__(self, "cargo_argv", tuple(argv))
 
 
-@dataclass
+# Shared by every package without build_config overrides; safe since frozen
+_EMPTY_BUILD_CONFIG = BuildConfig()
+
+
+@dataclass(frozen=True, slots=True)
 class Package:
     """Package definition"""
 
@@ -53,23 +61,24 @@ class Package:
     build: int = 1
     enabled: bool = True
     release: bool = False
-    binaries: List[str] = None
-    build_config: BuildConfig = None
-
-    def __post_init__(self):
-        if self.binaries is None:
-            self.binaries = [self.name]
-        if self.build_config is None:
-            self.build_config = BuildConfig()
-        elif isinstance(self.build_config, dict):
-            self.build_config = BuildConfig(**self.build_config)
+    binaries: Optional[List[str]] = None
+    build_config: BuildConfig = _EMPTY_BUILD_CONFIG
 
     @classmethod
     def from_dict(cls, data: Dict) -> "Package":
         """Create Package from dictionary"""
+        # Defaults are resolved here, once, rather than in a __post_init__
+        # that every construction (and dataclasses.replace) would pay for
+        binaries = data.get("binaries") or [data["name"]]
+
+        # The only place a raw build_config dict becomes a BuildConfig
         build_config = data.get("build_config")
         if build_config:
-            build_config = BuildConfig(**build_config)
+            # Explicit nulls fall back to the field defaults, as they used to
+            overrides = {k: v for k, v in build_config.items() if v is not None}
+            build_config = BuildConfig(**overrides)
+        else:
+            build_config = _EMPTY_BUILD_CONFIG
 
         return cls(
             name=data["name"],
@@ -80,7 +89,7 @@ class Package:
             build=data.get("build", 1),
             enabled=data.get("enabled", True),
             release=data.get("release", False),
-            binaries=data.get("binaries"),
+            binaries=binaries,
             build_config=build_config,
         )
 
@@ -260,25 +269,17 @@ class RustBuilder(Builder):
         # Get build configuration
         build_config = pkg.build_config
 
-        # Build cargo command
-        cargo_cmd = ["cargo", "build", "--release"]
+        # Build cargo command (features, target and extra flags are
+        # precomputed on the build config)
+        cargo_cmd = ["cargo", "build", "--release", *build_config.cargo_argv]
 
-        # Add custom features if specified
         if build_config.features:
-            features_str = ",".join(build_config.features)
-            cargo_cmd.extend(["--features", features_str])
-            print(f"    → Enabling features: {features_str}")
+            print(f"    → Enabling features: {','.join(build_config.features)}")
 
-        # Add custom target if specified
         target = build_config.target
         if target:
-            cargo_cmd.extend(["--target", target])
             print(f"    → Building for target: {target}")
 
-        # Add any additional cargo flags
-        if build_config.cargo_flags:
-            cargo_cmd.extend(build_config.cargo_flags)
-
         # Set environment variables if specified
         env = os.environ.copy()
         if build_config.env:
@@ -323,9 +324,9 @@ class RustBuilder(Builder):
         else:
             release_dir = repo_path / "target" / "release"
 
-        # Copy binaries
+        # Copy binaries; packages built without from_dict have none listed
         binaries_installed = False
-        for binary_name in pkg.binaries:
+        for binary_name in pkg.binaries or [pkg.name]:
             binary_src = release_dir / binary_name
             if binary_src.exists() and binary_src.is_file():
                 shutil.copy2(binary_src, bin_dir / binary_name)
@@ -1,15 +1,33 @@
 """Main package builder orchestrator."""
 
-import shutil
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 from slackware_pkg.builders import Builder, GenericBuilder
+from slackware_pkg.cache import BuildCache
 from slackware_pkg.config import ConfigLoader
 from slackware_pkg.git import GitRepository
 from slackware_pkg.models import Package
 from slackware_pkg.packager import SlackwarePackager
 from slackware_pkg.release import ReleaseDownloader
+from slackware_pkg.util import (
+    Jobserver,
+    ThreadOutput,
+    ensure_dirs,
+    forget_dirs,
+    mkdirp,
+    remove_in_background,
+)
+
+# Clones and downloads are network-bound and builds are CPU-bound, so they
+# are throttled separately to let one package clone while another compiles.
+GIT_JOBS = 8
+DOWNLOAD_JOBS = 8
+BUILD_JOBS = os.cpu_count() or 1
 
 
 class SlackwarePackageBuilder:
@@ -20,18 +38,26 @@ class SlackwarePackageBuilder:
         config_file: str = "config.json",
         build_root: str = "build",
         tmp_root: str = "tmp",
+        jobs: Optional[int] = None,
+        use_cache: bool = True,
+        compress_level: int = 6,
     ):
         self.config_file = config_file
         self.build_root = Path(build_root)
         self.tmp_root = Path(tmp_root)
         self.packages: List[Package] = []
-        self.builders: List[Builder] = [
-            GenericBuilder()
-        ]  # Generic builder that uses build_command from config
-
-        # Create directories if they don't exist
-        self.build_root.mkdir(parents=True, exist_ok=True)
-        self.tmp_root.mkdir(parents=True, exist_ok=True)
+        self.use_cache = use_cache
+        self.compress_level = compress_level
+        # One job budget for the whole machine, however many packages build
+        self.jobserver = Jobserver(BUILD_JOBS)
+        self.builders: List[Builder] = self._make_builders()
+        self.package_cache = self._make_package_cache()
+        self.git_slots = threading.Semaphore(GIT_JOBS)
+        self.download_slots = threading.Semaphore(DOWNLOAD_JOBS)
+        self.build_slots = threading.Semaphore(jobs or BUILD_JOBS)
+
+        # build_root and tmp_root are created on demand, as parents of the
+        # per-package directories below them
 
     def load_packages(self) -> None:
         """Load package definitions from JSON file"""
@@ -41,11 +67,22 @@ class SlackwarePackageBuilder:
         # Use config paths if available
         if config_loader.output_path:
             self.build_root = Path(config_loader.output_path)
-            self.build_root.mkdir(parents=True, exist_ok=True)
 
         if config_loader.temp_path:
             self.tmp_root = Path(config_loader.temp_path)
-            self.tmp_root.mkdir(parents=True, exist_ok=True)
+            self.builders = self._make_builders()
+            self.package_cache = self._make_package_cache()
+
+    def _make_builders(self) -> List[Builder]:
+        """Create the builders, pointing their caches at tmp_root"""
+        # Generic builder that uses build_command from config
+        return [GenericBuilder(self.tmp_root, self.jobserver)]
+
+    def _make_package_cache(self) -> Optional[BuildCache]:
+        """Create the cache of built packages under tmp_root, unless disabled"""
+        if not self.use_cache:
+            return None
+        return BuildCache(self.tmp_root / ".pkg-cache")
 
     def build_package(self, pkg: Package, repo_path: Path, install_dir: Path) -> bool:
         """Build the package from source"""
@@ -69,7 +106,7 @@ class SlackwarePackageBuilder:
 
         # Create output directory following un-get format
         output_dir = self.build_root / "slackware64-current" / name
-        output_dir.mkdir(parents=True, exist_ok=True)
+        mkdirp(output_dir)
 
         # Check if this is a release package (download directly)
         if pkg.release:
@@ -77,7 +114,8 @@ class SlackwarePackageBuilder:
 
             try:
                 # Download the release directly to output directory
-                pkg_file = ReleaseDownloader.download_release(pkg, output_dir)
+                with self.download_slots:
+                    pkg_file = ReleaseDownloader.download_release(pkg, output_dir)
                 if not pkg_file:
                     print(f"✗ Failed to download release for {name}\n")
                     return False
@@ -92,37 +130,57 @@ class SlackwarePackageBuilder:
         # Build from source (existing behavior)
         print(f"  → Building from source")
 
-        # Create temporary working directory
+        # Create temporary working directory along with the whole install
+        # staging skeleton inside it, so later steps find it already there
         temp_dir = self.tmp_root / f"{name}-build"
-        temp_dir.mkdir(parents=True, exist_ok=True)
+        install_dir = temp_dir / "install_staging"
+        ensure_dirs(
+            install_dir / "install",
+            install_dir / "usr" / "bin",
+            install_dir / "usr" / "doc" / f"{name}-{pkg.version}",
+        )
 
         try:
             # Clone repository
-            repo_path = GitRepository.clone_or_update(pkg, temp_dir)
+            with self.git_slots:
+                # --no-cache also bypasses the repository mirrors
+                git_cache = self.tmp_root / ".git-cache" if self.use_cache else None
+                repo_path = GitRepository.clone_or_update(pkg, temp_dir, git_cache)
             if not repo_path:
                 print(f"✗ Failed to prepare {name}\n")
                 return False
 
-            # Create install staging directory
-            install_dir = temp_dir / "install_staging"
-            install_dir.mkdir(exist_ok=True)
-
-            # Build the package
-            if not self.build_package(pkg, repo_path, install_dir):
-                print(f"✗ Failed to build {name}\n")
-                return False
+            # Same commit and build inputs as an earlier run: reuse its archive
+            cache_key = None
+            if self.package_cache is not None:
+                cache_key = BuildCache.key(pkg, repo_path, self.compress_level)
+            if cache_key is not None:
+                cached_file = output_dir / SlackwarePackager.package_filename(pkg)
+                if self.package_cache.restore(cache_key, cached_file):
+                    print(f"  ✓ Reused cached package: {cached_file}")
+                    print(f"✓ Successfully built {name}")
+                    return True
+
+            with self.build_slots:
+                # Build the package
+                if not self.build_package(pkg, repo_path, install_dir):
+                    print(f"✗ Failed to build {name}\n")
+                    return False
 
-            # Create slack-desc
-            SlackwarePackager.create_slack_desc(pkg, install_dir)
+                # Create slack-desc
+                SlackwarePackager.create_slack_desc(pkg, install_dir)
 
-            # Create package archive
-            pkg_file = SlackwarePackager.create_package_archive(
-                pkg, install_dir, output_dir
-            )
+                # Create package archive
+                pkg_file = SlackwarePackager.create_package_archive(
+                    pkg, install_dir, output_dir, compresslevel=self.compress_level
+                )
             if not pkg_file:
                 print(f"✗ Failed to create package for {name}\n")
                 return False
 
+            if cache_key is not None:
+                self.package_cache.store(cache_key, pkg_file)
+
             print(f"✓ Successfully built {name}")
             return True
 
@@ -133,7 +191,17 @@ class SlackwarePackageBuilder:
             # Clean up temp directory after build
             if temp_dir.exists():
                 print(f"  → Cleaning up temporary files...")
-                shutil.rmtree(temp_dir, ignore_errors=True)
+                remove_in_background(temp_dir)
+                forget_dirs(temp_dir)
+
+    def _build_captured(self, output: ThreadOutput, pkg: Package) -> Tuple[bool, str]:
+        """Build a package, returning its result along with everything it printed"""
+        output.capture()
+        try:
+            success = self.build_single_package_direct(pkg)
+        finally:
+            log = output.release()
+        return success, log
 
     def build_all_packages(self) -> None:
         """Build all packages defined in the configuration"""
@@ -158,12 +226,33 @@ class SlackwarePackageBuilder:
             )
             print(f"{'=' * 60}\n")
 
-        for pkg in build_list:
-            name = pkg.name
-            # Use the single package build method
-            self.build_single_package_direct(pkg)
+        # Packages are independent, so run their pipelines concurrently;
+        # the slots bound how many clone, download or build at once
+        failed = []
+        if build_list:
+            stdout = sys.stdout
+            output = ThreadOutput(stdout)
+            sys.stdout = output
+            try:
+                with ThreadPoolExecutor(max_workers=len(build_list)) as executor:
+                    futures = {
+                        executor.submit(self._build_captured, output, pkg): pkg
+                        for pkg in build_list
+                    }
+                    # Each package's log is printed in one piece as it finishes,
+                    # so concurrent builds don't interleave their lines
+                    for future in as_completed(futures):
+                        success, log = future.result()
+                        output.write(log)
+                        output.flush()
+                        if not success:
+                            failed.append(futures[future].name)
+            finally:
+                sys.stdout = stdout
 
         print(f"\n{'=' * 60}")
+        if failed:
+            print(f"✗ {len(failed)} package(s) failed: {', '.join(sorted(failed))}")
         print(
             f"Build complete! Packages saved to: {self.build_root / 'slackware64-current'}"
         )
@@ -5,8 +5,22 @@ import shutil
 import subprocess
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Dict, Optional, Set, Union
 
+from slackware_pkg.config import json_loads
 from slackware_pkg.models import Package
+from slackware_pkg.util import Jobserver, fastcopy, mkdirp, run_streaming
+
+# Documentation shipped in /usr/doc/<name>-<version> when present in the repo
+DOC_FILES = frozenset({"README.md", "LICENSE", "CHANGELOG.md"})
+
+
+def _link_or_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Stage src at dst, hard-linking instead of copying on the same filesystem"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        fastcopy(src, dst)
 
 
 class Builder(ABC):
@@ -26,6 +40,18 @@ class Builder(ABC):
 class GenericBuilder(Builder):
     """Generic builder that uses build_command from config"""
 
+    def __init__(
+        self, cache_root: Path = Path("tmp"), jobserver: Optional[Jobserver] = None
+    ):
+        # Build caches that outlive a single package's temp dir live here
+        self.cache_root = cache_root
+        self.sccache_dir = cache_root / ".sccache"
+        self.log_dir = cache_root / "logs"
+        # Shared by concurrent cargo builds so they don't each start nproc jobs
+        self.jobserver = jobserver
+        # Copying os.environ decodes every entry, so rust builds share one copy
+        self._rust_env: Optional[Dict[str, str]] = None
+
     def can_build(self, pkg: Package, repo_path: Path) -> bool:
         """Check if package has a build_command specified"""
         return pkg.build_command is not None
@@ -42,28 +68,139 @@ class GenericBuilder(Builder):
             print(f"✗ No build_command specified for {name}")
             return False
 
+        env = self._build_environment(pkg)
+
+        # A wrong bin_path would otherwise only surface after the full compile
+        if pkg.build_env == "rust" and pkg.bin_path:
+            binary = Path(pkg.bin_path).name
+            declared = self._probe_binaries(repo_path, env)
+            if declared is not None and binary not in declared:
+                print(f"✗ Cargo manifest declares no binary named '{binary}'")
+                print(f"    Declared binaries: {', '.join(sorted(declared)) or 'none'}")
+                return False
+
         # Execute build command
         print(f"    → Running: {build_command}")
-        result = subprocess.run(
+        mkdirp(self.log_dir)
+        log_path = self.log_dir / f"{name}.log"
+        pass_fds = ()
+        if pkg.build_env == "rust" and self.jobserver is not None:
+            pass_fds = self.jobserver.fds
+        returncode, output = run_streaming(
             build_command,
+            log_path,
             shell=True,
             cwd=repo_path,
-            capture_output=True,
-            text=True,
+            env=env,
+            pass_fds=pass_fds,
         )
 
-        if result.returncode != 0:
-            print(f"✗ Build failed:")
-            print(result.stderr)
+        if returncode != 0:
+            print(f"✗ Build failed (full log: {log_path}):")
+            print(output)
             return False
 
         print(f"    ✓ Build completed successfully")
 
         # Install to staging directory
-        return self._install_artifacts(pkg, repo_path, install_dir)
+        return self._install_artifacts(pkg, repo_path, install_dir, env)
+
+    def _rust_base_environment(self) -> Dict[str, str]:
+        """Environment shared by every rust build, assembled on first use"""
+        if self._rust_env is None:
+            env = os.environ.copy()
+            env.setdefault("CARGO_NET_GIT_FETCH_WITH_CLI", "true")
+
+            # Keep the compiler cache across builds too. CARGO_HOME is left
+            # alone: ~/.cargo already persists, with the user's cargo config
+            if "SCCACHE_DIR" not in env:
+                # Created here, so runs without rust packages leave no trace
+                mkdirp(self.sccache_dir)
+                env["SCCACHE_DIR"] = str(self.sccache_dir.resolve())
+            # Only when sccache is there: even an empty RUSTC_WRAPPER would
+            # override a build.rustc-wrapper from the user's cargo config
+            sccache = shutil.which("sccache")
+            if sccache:
+                env.setdefault("RUSTC_WRAPPER", sccache)
+            if self.jobserver is not None:
+                # cargo joins a jobserver it finds here instead of running
+                # its own; only CARGO_MAKEFLAGS, so plain make stays serial
+                env["CARGO_MAKEFLAGS"] = self.jobserver.makeflags
+            self._rust_env = env
+        return self._rust_env
+
+    def _build_environment(self, pkg: Package) -> Optional[Dict[str, str]]:
+        """Environment for the build command, or None to inherit ours as-is"""
+        if pkg.build_env != "rust":
+            return None
+
+        env = self._rust_base_environment()
+        if "CARGO_TARGET_DIR" in env:
+            # Set by the user; nothing varies per package, so share the dict
+            return env
+
+        # A target dir outside the checkout survives it, so re-runs only
+        # rebuild what changed. It is per package because cargo locks the target dir
+        # for a whole build, which would serialize concurrent packages;
+        # sccache still shares compiled dependencies between them
+        target_root = env.get("SLACKPKG_TARGET_DIR", self.cache_root / ".cargo-target")
+        target_dir = Path(target_root).resolve() / pkg.name
+        return {**env, "CARGO_TARGET_DIR": str(target_dir)}
+
+    @staticmethod
+    def _probe_binaries(
+        repo_path: Path, env: Optional[Dict[str, str]]
+    ) -> Optional[Set[str]]:
+        """Names of the bin targets the cargo manifest declares, None if unknown"""
+        manifest = repo_path / "Cargo.toml"
+        if not manifest.is_file():
+            return None
+
+        try:
+            result = subprocess.run(
+                [
+                    "cargo",
+                    "metadata",
+                    "--no-deps",
+                    "--format-version=1",
+                    "--manifest-path",
+                    str(manifest),
+                ],
+                cwd=repo_path,
+                env=env,
+                capture_output=True,
+            )
+        except OSError:
+            return None
+        if result.returncode != 0:
+            # Let the real build report whatever is wrong with the manifest
+            return None
+
+        metadata = json_loads(result.stdout)
+        return {
+            target["name"]
+            for package in metadata["packages"]
+            for target in package["targets"]
+            if "bin" in target["kind"]
+        }
+
+    @staticmethod
+    def _binary_path(
+        pkg: Package, repo_path: Path, env: Optional[Dict[str, str]]
+    ) -> Path:
+        """Locate the built binary named by bin_path"""
+        bin_path = Path(pkg.bin_path)
+        if env and "CARGO_TARGET_DIR" in env and bin_path.parts[0] == "target":
+            # cargo wrote target/... under CARGO_TARGET_DIR, not the repo
+            return Path(env["CARGO_TARGET_DIR"]).joinpath(*bin_path.parts[1:])
+        return repo_path / bin_path
 
     def _install_artifacts(
-        self, pkg: Package, repo_path: Path, install_dir: Path
+        self,
+        pkg: Package,
+        repo_path: Path,
+        install_dir: Path,
+        env: Optional[Dict[str, str]] = None,
     ) -> bool:
         """Install build artifacts to staging directory"""
         print(f"    → Installing to staging directory...")
@@ -71,29 +208,33 @@ class GenericBuilder(Builder):
         # Create directory structure
         bin_dir = install_dir / "usr" / "bin"
         doc_dir = install_dir / "usr" / "doc" / f"{pkg.name}-{pkg.version}"
-        bin_dir.mkdir(parents=True, exist_ok=True)
-        doc_dir.mkdir(parents=True, exist_ok=True)
+        mkdirp(bin_dir)
+        mkdirp(doc_dir)
 
         # bin_path is required - it tells us exactly where the binary is
         if not pkg.bin_path:
             print(f"✗ bin_path not specified in config for {pkg.name}")
             return False
 
-        binary_src = repo_path / pkg.bin_path
-        if not binary_src.exists() or not binary_src.is_file():
+        binary_src = self._binary_path(pkg, repo_path, env)
+        if not binary_src.is_file():  # a single stat; False when missing too
             print(f"✗ Binary not found at specified path: {pkg.bin_path}")
             return False
 
-        # Use the package name as the installed binary name
+        # Use the package name as the installed binary name. Plain strings
+        # from here on: os.path.join skips PurePath's parsing per file
         binary_name = pkg.name
-        shutil.copy2(binary_src, bin_dir / binary_name)
-        os.chmod(bin_dir / binary_name, 0o755)
+        binary_dst = os.path.join(os.fspath(bin_dir), binary_name)
+        _link_or_copy(binary_src, binary_dst)
+        os.chmod(binary_dst, 0o755)
         print(f"    ✓ Installed binary: {binary_name} (from {pkg.bin_path})")
 
         # Copy documentation
-        for doc_file in ["README.md", "LICENSE", "CHANGELOG.md"]:
-            src = repo_path / doc_file
-            if src.exists():
-                shutil.copy2(src, doc_dir / doc_file)
+        # One directory read instead of a stat per candidate doc file
+        doc_dir_s = os.fspath(doc_dir)
+        with os.scandir(repo_path) as entries:
+            for entry in entries:
+                if entry.name in DOC_FILES and entry.is_file():
+                    _link_or_copy(entry.path, os.path.join(doc_dir_s, entry.name))
 
         return True
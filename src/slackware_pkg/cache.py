@@ -0,0 +1,81 @@
+"""Cache of built packages keyed on their source commit and build inputs."""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from slackware_pkg.models import Package
+from slackware_pkg.util import mkdirp
+
+# Package fields that change what ends up in the archive (or its name)
+KEY_FIELDS = (
+    "name",
+    "git_url",
+    "version",
+    "description",
+    "build",
+    "build_env",
+    "build_command",
+    "bin_path",
+)
+
+
+class BuildCache:
+    """Stores finished .tgz archives so unchanged packages aren't rebuilt"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(pkg: Package, repo_path: Path, compresslevel: int) -> Optional[str]:
+        """Hash of the checked-out commit and build inputs, None if unknown"""
+        try:
+            commit = subprocess.run(
+                ["git", "-C", str(repo_path), "rev-parse", "HEAD"],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+        inputs = {field: getattr(pkg, field) for field in KEY_FIELDS}
+        # Not a package field, but it changes the archive all the same
+        inputs["compresslevel"] = compresslevel
+        digest = hashlib.sha256(commit.encode())
+        digest.update(json.dumps(inputs, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _copy(self, src: Path, dest: Path) -> None:
+        """Copy src over dest so that readers never see a partial file"""
+        # Plain copies, not links: the packager rewrites archives in place,
+        # which would corrupt a cache entry sharing the output's inode
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def restore(self, key: str, output_file: Path) -> bool:
+        """Copy the cached archive for key to output_file, if there is one"""
+        cached = self.cache_dir / f"{key}.tgz"
+        try:
+            self._copy(cached, output_file)
+        except OSError:
+            # Usually just a miss; anything else is worth a rebuild too
+            return False
+        return True
+
+    def store(self, key: str, pkg_file: Path) -> None:
+        """Remember pkg_file as the archive built for key"""
+        try:
+            mkdirp(self.cache_dir)
+            self._copy(pkg_file, self.cache_dir / f"{key}.tgz")
+        except OSError as e:
+            # Only an optimization; the package itself was built fine
+            print(f"  ⚠ Could not cache {pkg_file.name}: {e}")
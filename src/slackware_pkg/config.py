@@ -1,11 +1,24 @@
 """Configuration loader for package definitions."""
 
 import json
+import os
+import pickle
 import sys
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from slackware_pkg.models import Package
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+# the stdlib exception for either parser
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Bump whenever Package changes shape so stale pickles are never loaded
+CACHE_SCHEMA = 2
+
 
 class ConfigLoader:
     """Loads package configuration from JSON file"""
@@ -14,20 +27,66 @@ class ConfigLoader:
         self.config_file = config_file
         self.output_path = None
         self.temp_path = None
+        self.by_name: Dict[str, Package] = {}
+
+    def _cache_path(self, st: os.stat_result) -> Path:
+        """Parse cache file for the current contents of the config file"""
+        key = f"{CACHE_SCHEMA}-{st.st_mtime_ns}-{st.st_size}"
+        return Path(f"{self.config_file}.cache.{key}.pkl")
+
+    @staticmethod
+    def _read_cache(cache_path: Path) -> Optional[Tuple[str, str, List[Package]]]:
+        """Load a previously parsed config, or None on a miss"""
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            # Missing, truncated or incompatible - just parse the JSON again
+            return None
+
+    def _write_cache(
+        self, cache_path: Path, parsed: Tuple[str, str, List[Package]]
+    ) -> None:
+        """Store the parsed config and drop caches of older versions of it"""
+        try:
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+
+            for stale in cache_path.parent.glob(
+                f"{Path(self.config_file).name}.cache.*.pkl"
+            ):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+        except OSError:
+            # The cache is only an optimization (e.g. the config dir is read-only)
+            pass
+
+    def get(self, name: str) -> Optional[Package]:
+        """Look up a loaded package by name"""
+        return self.by_name.get(name)
 
     def load_packages(self) -> List[Package]:
         """Load package definitions from JSON file"""
         try:
-            with open(self.config_file, "r") as f:
-                data = json.load(f)
+            cache_path = self._cache_path(os.stat(self.config_file))
+            parsed = self._read_cache(cache_path)
+
+            if parsed is None:
+                # One bytes read, decoded in C by orjson when it is installed
+                data = json_loads(Path(self.config_file).read_bytes())
 
-                # Load global paths
-                self.output_path = data.get("output_path", "./output")
-                self.temp_path = data.get("temp_path", "./tmp")
+                # Load global paths and packages
+                parsed = (
+                    data.get("output_path", "./output"),
+                    data.get("temp_path", "./tmp"),
+                    [Package.from_dict(pkg) for pkg in data.get("packages", [])],
+                )
+                self._write_cache(cache_path, parsed)
 
-                # Load packages
-                packages_data = data.get("packages", [])
-                packages = [Package.from_dict(pkg) for pkg in packages_data]
+            self.output_path, self.temp_path, packages = parsed
+            self.by_name = {pkg.name: pkg for pkg in packages}
 
             print(f"✓ Loaded {len(packages)} package(s) from {self.config_file}")
             return packages
@@ -1,45 +1,247 @@
 """Git repository operations."""
 
+import hashlib
+import os
+import shutil
 import subprocess
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 from slackware_pkg.models import Package
+from slackware_pkg.util import forget_dirs, mkdirp, run_streaming
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# One lock per cached repository so concurrent builds of the same git_url
+# don't fetch into (or reset) the same clone at once
+_cache_locks: Dict[Path, threading.Lock] = {}
+_cache_locks_guard = threading.Lock()
 
 
 class GitRepository:
     """Handles git repository operations"""
 
     @staticmethod
-    def clone_or_update(pkg: Package, work_dir: Path) -> Optional[Path]:
-        """Clone the git repository and checkout specified tag"""
+    def _run(args: List[str]) -> None:
+        """Run a git command non-interactively, raising on failure"""
+        # Git's chatter is only worth showing when the command fails
+        returncode, output = run_streaming(
+            args, echo=False, env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        )
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, args, output=output)
+
+    @staticmethod
+    def _clone_command(git_url: str, tag: str, dest: Path) -> List[str]:
+        """Build the argv for a shallow, blobless clone of a single ref"""
+        # Blobs are fetched lazily, only for files the checkout and build touch
+        return [
+            "git",
+            "-c",
+            "protocol.version=2",
+            "clone",
+            "--depth",
+            "1",
+            "--single-branch",
+            "--no-tags",
+            "--filter=blob:none",
+            "--branch",
+            tag,
+            git_url,
+            str(dest),
+        ]
+
+    @staticmethod
+    def _clone_in_process(git_url: str, tag: str, dest: Path) -> None:
+        """Shallow-clone a single branch or tag with libgit2"""
+        repo = pygit2.init_repository(str(dest))
+        remote = repo.remotes.create("origin", git_url)
+
+        # libgit2's local transport can't fetch shallow (nor needs to)
+        local = git_url.startswith("file://") or Path(git_url).exists()
+
+        # Like git clone --branch, accept either a branch or a tag; refspecs
+        # whose source doesn't exist on the remote are simply skipped
+        refs = [f"refs/heads/{tag}", f"refs/tags/{tag}"]
+        remote.fetch(
+            [f"+{ref}:{ref}" for ref in refs], depth=0 if local else 1, proxy=True
+        )
+        ref = next((ref for ref in refs if ref in repo.references), None)
+        if ref is None:
+            raise KeyError(f"Remote branch {tag} not found in upstream origin")
+
+        commit = repo.revparse_single(ref).peel(pygit2.Commit)
+        repo.checkout_tree(commit)
+        repo.set_head(commit.id)
+
+    @staticmethod
+    def _clone(git_url: str, tag: str, dest: Path) -> None:
+        """Clone a single ref into dest, in-process via libgit2 when available"""
+        if pygit2 is not None:
+            # libgit2 saves forking git (and re-reading its config) per clone,
+            # and releases the GIL so concurrent builds clone in parallel
+            try:
+                GitRepository._clone_in_process(git_url, tag, dest)
+                return
+            except (pygit2.GitError, KeyError, ValueError) as e:
+                # Unknown refs and transports libgit2 lacks; git reports
+                # the former properly and may manage the latter
+                print(f"  → libgit2 clone failed ({e}), using git")
+                shutil.rmtree(dest, ignore_errors=True)
+
+        GitRepository._run(GitRepository._clone_command(git_url, tag, dest))
+
+    @staticmethod
+    def _export(git_url: str, tag: str, dest: Path) -> bool:
+        """Extract just the tree of tag into dest, False if the remote can't"""
+        # git archive --remote needs upload-archive, which servers often
+        # disable (and smart HTTP doesn't offer), so failure is expected
+        mkdirp(dest)
+        try:
+            archive = subprocess.Popen(
+                ["git", "archive", "--remote", git_url, "--format=tar", tag],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            )
+        except OSError:
+            return False
+
+        try:
+            tar = subprocess.Popen(
+                ["tar", "-xf", "-", "-C", str(dest)],
+                stdin=archive.stdout,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            # e.g. no tar on PATH; don't leave git archive behind unreaped
+            archive.kill()
+            archive.stdout.close()
+            archive.wait()
+            return False
+
+        archive.stdout.close()
+        # Reap both before judging, whichever of them failed
+        tar_ok = tar.wait() == 0
+        archive_ok = archive.wait() == 0
+        return tar_ok and archive_ok
+
+    @staticmethod
+    def _cache_lock(cache_dir: Path) -> threading.Lock:
+        """Get the lock guarding a cached repository"""
+        with _cache_locks_guard:
+            return _cache_locks.setdefault(cache_dir, threading.Lock())
+
+    @staticmethod
+    def ensure_cached(git_url: str, tag: str, cache_dir: Path) -> Path:
+        """Clone git_url into the bare repo cache_dir, or refresh the clone"""
+        if (cache_dir / "HEAD").exists():
+            print(f"  → Updating cached clone of {git_url}")
+            try:
+                # Branches and tags only; a mirror's refs/* would also pull in
+                # every refs/pull/* on GitHub. Tags are forced like branches,
+                # since moving tags (e.g. nightly) are rewritten upstream
+                GitRepository._run(
+                    [
+                        "git",
+                        "-C",
+                        str(cache_dir),
+                        "fetch",
+                        "--prune",
+                        "origin",
+                        "+refs/heads/*:refs/heads/*",
+                        "+refs/tags/*:refs/tags/*",
+                    ]
+                )
+                return cache_dir
+            except subprocess.CalledProcessError:
+                # Start over rather than fail every later build of git_url
+                print(f"  → Cached clone could not be updated, cloning again")
+        else:
+            print(f"  → Cloning {git_url}")
+
+        # Drop the broken clone, or leftovers of an interrupted one
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        # A cold cache (always the case in CI) only gets the ref being built,
+        # as shallow as the uncached clone; the first refresh fetches every
+        # branch and tag, after which only what changed is fetched. Blobs are
+        # fetched lazily as worktrees need them
+        GitRepository._run(
+            [
+                "git",
+                "-c",
+                "protocol.version=2",
+                "clone",
+                "--bare",
+                "--depth",
+                "1",
+                "--single-branch",
+                "--filter=blob:none",
+                "--branch",
+                tag,
+                git_url,
+                str(cache_dir),
+            ]
+        )
+        return cache_dir
+
+    @staticmethod
+    def clone_or_update(
+        pkg: Package, work_dir: Path, cache_root: Optional[Path] = None
+    ) -> Optional[Path]:
+        """Check out the specified tag, reusing a cached clone when cache_root is set"""
         repo_name = pkg.name
         git_url = pkg.git_url
         tag = pkg.tag
         repo_path = work_dir / repo_name
 
-        print(f"  → Cloning {git_url} (branch: {tag})")
-
         try:
-            # Clone the repository
-            subprocess.run(
-                [
-                    "git",
-                    "clone",
-                    "--branch",
-                    tag,
-                    "--depth",
-                    "1",
-                    git_url,
-                    str(repo_path),
-                ],
-                check=True,
-                capture_output=True,
-            )
+            if cache_root is None:
+                # Nothing will reuse this checkout, so only fetch the files
+                # and skip writing a .git directory where the remote allows
+                print(f"  → Exporting {git_url} (branch: {tag})")
+                if not GitRepository._export(git_url, tag, repo_path):
+                    shutil.rmtree(repo_path, ignore_errors=True)
+                    forget_dirs(repo_path)
+                    print(f"  → Export unavailable, cloning instead")
+                    GitRepository._clone(git_url, tag, repo_path)
+            else:
+                cache_dir = (
+                    cache_root / f"{hashlib.sha1(git_url.encode()).hexdigest()}.git"
+                )
+                with GitRepository._cache_lock(cache_dir):
+                    GitRepository.ensure_cached(git_url, tag, cache_dir)
+
+                    # Give the build a private checkout sharing the cache's objects;
+                    # pruning first forgets worktrees of already cleaned-up builds.
+                    # The checkout is detached: a build-<tag> branch would be
+                    # deleted by the next fetch --prune of the cache
+                    GitRepository._run(
+                        ["git", "-C", str(cache_dir), "worktree", "prune"]
+                    )
+                    GitRepository._run(
+                        [
+                            "git",
+                            "-C",
+                            str(cache_dir),
+                            "worktree",
+                            "add",
+                            "--force",
+                            "--detach",
+                            str(repo_path.resolve()),
+                            f"{tag}^{{commit}}",
+                        ]
+                    )
 
             print(f"  ✓ Repository cloned successfully")
             return repo_path
 
         except subprocess.CalledProcessError as e:
             print(f"✗ Error cloning repository: {e}")
+            if e.output:
+                print(e.output)
             return None
@@ -1,14 +1,13 @@
 """Main entry point for the Slackware Package Builder."""
 
 import argparse
-import json
+import dataclasses
 import os
 import sys
 from pathlib import Path
-from typing import Optional
 
 from slackware_pkg.builder import SlackwarePackageBuilder
-from slackware_pkg.models import Package
+from slackware_pkg.config import ConfigLoader
 
 
 def parse_args():
@@ -48,28 +47,31 @@ def parse_args():
         default="./tmp",
         help="Temporary directory for build files (default: ./tmp)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of packages to build at once (default: number of CPUs)",
+    )
 
-    return parser.parse_args()
-
-
-def find_package_in_config(config_file: str, package_name: str) -> Optional[Package]:
-    """Find a package by name in the config file"""
-    try:
-        with open(config_file, "r") as f:
-            data = json.load(f)
-            packages_data = data.get("packages", [])
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Build every package from a fresh checkout, ignoring cached builds and repositories",
+    )
 
-            for pkg_data in packages_data:
-                if pkg_data.get("name") == package_name:
-                    return Package.from_dict(pkg_data)
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        default=6,
+        choices=range(1, 10),
+        metavar="{1-9}",
+        help="gzip level for package archives; 1 is fastest (default: 6)",
+    )
 
-            return None
-    except FileNotFoundError:
-        print(f"✗ Error: Config file '{config_file}' not found")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"✗ Error: Invalid JSON in config file: {e}")
-        return None
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
 
 
 def main():
@@ -83,27 +85,33 @@ def main():
 
     if args.package:
         # Single package mode - build one package from config
-        pkg = find_package_in_config(args.config, args.package)
+        config_loader = ConfigLoader(args.config)
+        config_loader.load_packages()
+        pkg = config_loader.get(args.package)
 
         if not pkg:
             print(f"✗ Error: Package '{args.package}' not found in {args.config}")
             sys.exit(1)
 
-        # If --tag is provided, override the tag and version
+        # If --tag is provided, override the tag (the version follows it)
         if args.tag:
-            pkg.tag = args.tag
-            pkg.version = pkg._derive_version_from_tag(args.tag)
+            pkg = dataclasses.replace(pkg, tag=args.tag)
 
         # Create builder
         builder = SlackwarePackageBuilder(
             config_file=args.config,
             build_root=args.output,
             tmp_root=args.temp,
+            jobs=args.jobs,
+            use_cache=not args.no_cache,
+            compress_level=args.compress_level,
         )
 
-        # Build the single package
+        # Build the single package; release packages are only downloaded,
+        # with no clone or build
+        action = "Downloading release" if pkg.release else "Building package"
         print(f"\n{'=' * 60}")
-        print(f"Building package: {args.package} (tag: {pkg.tag})")
+        print(f"{action}: {args.package} (tag: {pkg.tag})")
         print(f"{'=' * 60}\n")
 
         success = builder.build_single_package_direct(pkg)
@@ -111,12 +119,14 @@ def main():
         if success:
             print(f"\n{'=' * 60}")
             print(
-                f"✓ Build complete! Package saved to: {Path(args.output) / 'slackware64-current' / args.package}"
+                f"✓ {'Download' if pkg.release else 'Build'} complete! Package saved to: {Path(args.output) / 'slackware64-current' / args.package}"
             )
             print(f"{'=' * 60}\n")
         else:
             print(f"\n{'=' * 60}")
-            print(f"✗ Build failed for {args.package}")
+            print(
+                f"✗ {'Download' if pkg.release else 'Build'} failed for {args.package}"
+            )
             print(f"{'=' * 60}\n")
 
         sys.exit(0 if success else 1)
@@ -127,6 +137,9 @@ def main():
             config_file=args.config,
             build_root=args.output,
             tmp_root=args.temp,
+            jobs=args.jobs,
+            use_cache=not args.no_cache,
+            compress_level=args.compress_level,
         )
         builder.load_packages()
         builder.build_all_packages()
@@ -1,41 +1,29 @@
 """Data models for package definitions."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Package:
     """Package definition"""
 
-    def __init__(
-        self,
-        name: str,
-        git_url: str,
-        tag: str,
-        description: str,
-        build: int = 1,
-        enabled: bool = True,
-        release: bool = False,
-        build_env: Optional[str] = None,
-        build_command: Optional[str] = None,
-        bin_path: Optional[str] = None,
-        only: bool = False,
-    ):
-        self.name = name
-        self.git_url = git_url
-        self.tag = tag
-        self.description = description
-        self.build = build
-        self.enabled = enabled
-        self.release = release
-        self.build_env = build_env
-        self.build_command = build_command
-        self.bin_path = bin_path
-        self.only = only
+    name: str
+    git_url: str
+    tag: str
+    description: str
+    build: int = 1
+    enabled: bool = True
+    release: bool = False
+    build_env: Optional[str] = None
+    build_command: Optional[str] = None
+    bin_path: Optional[str] = None
+    only: bool = False
+    version: str = field(init=False)
 
-        # Derive version from tag
-        self.version = self._derive_version_from_tag(tag)
+    def __post_init__(self):
+        # Derive version from tag (frozen, so bypass the dataclass __setattr__)
+        object.__setattr__(self, "version", self._derive_version_from_tag(self.tag))
 
     @staticmethod
     def _derive_version_from_tag(tag: str) -> str:
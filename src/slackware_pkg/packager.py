@@ -1,10 +1,20 @@
 """Slackware package creation utilities."""
 
+import gzip
+import os
+import shutil
 import subprocess
+import tarfile
+import textwrap
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from slackware_pkg.models import Package
+from slackware_pkg.util import mkdirp
+
+# Parallel gzip, looked up once rather than per package. Slackware's pkgtools
+# expect a gzip stream in a .tgz, so zstd is not an option here
+PIGZ = shutil.which("pigz")
 
 
 class SlackwarePackager:
@@ -17,7 +27,7 @@ class SlackwarePackager:
         desc = pkg.description
 
         install_docs_dir = install_dir / "install"
-        install_docs_dir.mkdir(exist_ok=True)
+        mkdirp(install_docs_dir)
 
         slack_desc = install_docs_dir / "slack-desc"
 
@@ -33,55 +43,107 @@ class SlackwarePackager:
             f"{' ' * (len(name) - 1)}|-----handy-ruler------------------------------------------------------|",
         ]
 
-        # Split description into lines of max 60 characters
-        desc_lines = []
-        words = desc.split()
-        current_line = ""
+        # Split description into lines of at most 59 characters, so that
+        # with the trailing space the old word-by-word loop counted they fit 60
+        desc_lines = textwrap.wrap(
+            " ".join(desc.split()),
+            width=59,
+            break_long_words=False,
+            break_on_hyphens=False,
+        )
 
-        for word in words:
-            if len(current_line) + len(word) + 1 <= 60:
-                current_line += word + " "
-            else:
-                desc_lines.append(current_line.strip())
-                current_line = word + " "
+        # Add description lines (need exactly 11, blank ones padding the end)
+        desc_lines = desc_lines[:11] + [""] * (11 - len(desc_lines))
+        lines += [f"{name}: {line}" if line else f"{name}:" for line in desc_lines]
 
-        if current_line:
-            desc_lines.append(current_line.strip())
+        # The file is tiny, so skip the text IO stack: one encode, one write.
+        # Descriptions come from the config and may not be ASCII, hence UTF-8
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        fd = os.open(slack_desc, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
 
-        # Add description lines (need 11 total)
-        for i in range(11):
-            if i < len(desc_lines):
-                lines.append(f"{name}: {desc_lines[i]}")
-            else:
-                lines.append(f"{name}:")
+    @staticmethod
+    def _normalize_tarinfo(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+        """Own every entry by root and pin mtimes so archives are reproducible"""
+        tarinfo.uid = tarinfo.gid = 0
+        tarinfo.uname = tarinfo.gname = "root"
+        tarinfo.mtime = 0
+        return tarinfo
+
+    @staticmethod
+    def _write_tar(install_dir: Path, fileobj: BinaryIO) -> None:
+        """Stream install_dir as an uncompressed tar into fileobj"""
+        # tarfile walks directories in sorted order, and files sharing an
+        # inode are written once, with later names stored as hard links
+        with tarfile.open(fileobj=fileobj, mode="w|", format=tarfile.GNU_FORMAT) as tf:
+            tf.add(
+                str(install_dir),
+                arcname=".",
+                filter=SlackwarePackager._normalize_tarinfo,
+            )
 
-        with open(slack_desc, "w") as f:
-            f.write("\n".join(lines) + "\n")
+    @staticmethod
+    def package_filename(pkg: Package, arch: str = "x86_64") -> str:
+        """File name of the package archive, e.g. foo-1.2.3-x86_64-1.tgz"""
+        return f"{pkg.name}-{pkg.version}-{arch}-{pkg.build}.tgz"
 
     @staticmethod
     def create_package_archive(
-        pkg: Package, install_dir: Path, output_dir: Path, arch: str = "x86_64"
+        pkg: Package,
+        install_dir: Path,
+        output_dir: Path,
+        arch: str = "x86_64",
+        compresslevel: int = 6,
     ) -> Optional[Path]:
         """Create the .tgz package archive"""
-        name = pkg.name
-        version = pkg.version
-        build = pkg.build
-
-        pkg_filename = f"{name}-{version}-{arch}-{build}.tgz"
+        pkg_filename = SlackwarePackager.package_filename(pkg, arch)
         output_file = output_dir / pkg_filename
 
         print(f"  → Creating package archive: {pkg_filename}")
 
-        # Create tar.gz archive
-        result = subprocess.run(
-            ["tar", "czf", str(output_file), "-C", str(install_dir), "."],
-            capture_output=True,
-            text=True,
-        )
-
-        if result.returncode != 0:
+        try:
+            with open(output_file, "wb") as f:
+                if PIGZ is None:
+                    # mtime=0 and no filename keep the gzip header reproducible
+                    with gzip.GzipFile(
+                        filename="",
+                        mode="wb",
+                        fileobj=f,
+                        compresslevel=compresslevel,
+                        mtime=0,
+                    ) as gz:
+                        SlackwarePackager._write_tar(install_dir, gz)
+                else:
+                    # Compression dominates archiving, so stream the tar
+                    # through pigz to gzip on every core
+                    gz = subprocess.Popen(
+                        [
+                            PIGZ,
+                            f"-{compresslevel}",
+                            "-n",
+                            "-p",
+                            str(os.cpu_count() or 1),
+                        ],
+                        stdin=subprocess.PIPE,
+                        stdout=f,
+                        stderr=subprocess.PIPE,
+                    )
+                    try:
+                        SlackwarePackager._write_tar(install_dir, gz.stdin)
+                    finally:
+                        gz.stdin.close()
+                        stderr = gz.stderr.read().decode(errors="replace")
+                        gz.wait()
+                    if gz.returncode != 0:
+                        raise OSError(f"pigz exited with {gz.returncode}: {stderr}")
+
+        except (OSError, tarfile.TarError) as e:
             print(f"✗ Failed to create package archive:")
-            print(result.stderr)
+            print(e)
+            output_file.unlink(missing_ok=True)
             return None
 
         print(f"  ✓ Package created: {output_file}")
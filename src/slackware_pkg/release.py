@@ -1,15 +1,28 @@
 """Release downloader for pre-built packages."""
 
-import subprocess
+import shutil
+import threading
 from pathlib import Path
 from typing import Optional
+from urllib.request import urlopen
 
 from slackware_pkg.models import Package
+from slackware_pkg.util import COPY_BUFSIZE
+
+try:
+    import urllib3
+except ImportError:
+    urllib3 = None
 
 
 class ReleaseDownloader:
     """Handles downloading official release packages"""
 
+    # Shared across downloads so connections (and TLS sessions) to the same
+    # host are kept alive; created on first use
+    _pool = None
+    _pool_lock = threading.Lock()
+
     @staticmethod
     def construct_release_url(pkg: Package) -> str:
         """Construct the release URL from git_url, tag, and name"""
@@ -21,6 +34,35 @@ class ReleaseDownloader:
         release_url = f"{git_url}/releases/download/{pkg.tag}/{pkg.name}-{pkg.version}-linux64.tgz"
         return release_url
 
+    @classmethod
+    def _pool_manager(cls) -> "urllib3.PoolManager":
+        """Get the shared connection pool"""
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = urllib3.PoolManager(maxsize=16)
+            return cls._pool
+
+    @classmethod
+    def _fetch(cls, url: str, output_file: Path) -> None:
+        """Stream url into output_file, following redirects"""
+        with open(output_file, "wb", buffering=0) as f:
+            if urllib3 is None:
+                # urlopen raises HTTPError (an OSError) for error statuses
+                with urlopen(url) as resp:
+                    shutil.copyfileobj(resp, f, COPY_BUFSIZE)
+                return
+
+            try:
+                resp = cls._pool_manager().request("GET", url, preload_content=False)
+                try:
+                    if resp.status >= 400:
+                        raise OSError(f"HTTP Error {resp.status}: {resp.reason}")
+                    shutil.copyfileobj(resp, f, COPY_BUFSIZE)
+                finally:
+                    resp.release_conn()
+            except urllib3.exceptions.HTTPError as e:
+                raise OSError(str(e)) from e
+
     @staticmethod
     def download_release(
         pkg: Package, output_dir: Path, arch: str = "x86_64"
@@ -35,22 +77,12 @@ class ReleaseDownloader:
         print(f"  → Downloading from {release_url}")
 
         try:
-            # Download using curl
-            subprocess.run(
-                [
-                    "curl",
-                    "-L",  # Follow redirects
-                    "-o",
-                    str(output_file),
-                    release_url,
-                ],
-                check=True,
-                capture_output=True,
-            )
+            ReleaseDownloader._fetch(release_url, output_file)
 
             print(f"  ✓ Package downloaded: {output_file}")
             return output_file
 
-        except subprocess.CalledProcessError as e:
+        except OSError as e:
             print(f"✗ Error downloading release: {e}")
+            output_file.unlink(missing_ok=True)
             return None
@@ -0,0 +1,201 @@
+"""Filesystem and subprocess helpers shared by the builder modules."""
+
+import errno
+import io
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import List, Optional, Set, TextIO, Tuple, Union
+
+# How much of a failing command's output is kept for the error report
+OUTPUT_TAIL_BYTES = 64 * 1024
+
+# Buffer for user-space copies; far fewer syscalls than shutil's 64 KiB default
+COPY_BUFSIZE = 1 << 20
+
+# Errors meaning "this copy mechanism isn't available here", not a real failure
+_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+# Directories this process has already created (or found to exist)
+_created: Set[str] = set()
+_created_lock = threading.Lock()
+
+
+def mkdirp(path: Path) -> None:
+    """Create path and its parents, skipping directories already made this run"""
+    key = str(path)
+    if key in _created:
+        return
+
+    path.mkdir(parents=True, exist_ok=True)
+    with _created_lock:
+        _created.add(key)
+        _created.update(str(parent) for parent in path.parents)
+
+
+def ensure_dirs(*paths: Path) -> None:
+    """Create several directories at once, e.g. a whole staging tree"""
+    # Parents are recorded as created too, so only the first path under a
+    # given root costs any syscalls for the shared part
+    for path in paths:
+        mkdirp(path)
+
+
+def forget_dirs(root: Path) -> None:
+    """Forget root and everything below it, e.g. after deleting the tree"""
+    key = str(root)
+    prefix = key + os.sep
+    with _created_lock:
+        _created.difference_update(
+            [d for d in _created if d == key or d.startswith(prefix)]
+        )
+
+
+def fastcopy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Copy src to dst in the kernel where possible, keeping mode and times"""
+    copiers = [
+        lambda fd_in, fd_out: os.copy_file_range(fd_in, fd_out, 1 << 30),
+        lambda fd_in, fd_out: os.sendfile(fd_out, fd_in, None, 1 << 30),
+    ]
+    if not hasattr(os, "copy_file_range"):
+        copiers.pop(0)
+
+    # Unbuffered destination: every write is already COPY_BUFSIZE-sized
+    with open(src, "rb") as fsrc, open(dst, "wb", buffering=0) as fdst:
+        fd_in, fd_out = fsrc.fileno(), fdst.fileno()
+        for copy_chunk in copiers:
+            try:
+                while copy_chunk(fd_in, fd_out):
+                    pass
+                break
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+        else:
+            shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+
+        # Metadata through the open fds, rather than copystat's path lookups
+        st = os.fstat(fd_in)
+        os.fchmod(fd_out, st.st_mode)
+        os.utime(fd_out, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+class ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that buffers the prints of capturing threads"""
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self) -> None:
+        """Start buffering this thread's output"""
+        self._local.chunks = []
+
+    def release(self) -> str:
+        """Stop buffering this thread's output and return what was printed"""
+        chunks = self._local.__dict__.pop("chunks", [])
+        return "".join(chunks)
+
+    def write(self, s: str) -> int:
+        chunks = getattr(self._local, "chunks", None)
+        if chunks is None:
+            return self._stream.write(s)
+        chunks.append(s)
+        return len(s)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def run_streaming(
+    args: Union[str, List[str]],
+    log_path: Optional[Path] = None,
+    echo: bool = True,
+    **popen_kwargs,
+) -> Tuple[int, str]:
+    """Run a command, teeing its output to log_path and returning the tail"""
+    # A verbose build can log tens of MB; streaming it to disk keeps memory
+    # flat, and only the end is held on to for the error report
+    proc = subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, **popen_kwargs
+    )
+
+    # Show progress live, unless stdout is buffering a package's output to
+    # print in one piece; the log file and the tail cover that case
+    stdout = sys.stdout
+    echo_to = None
+    if echo and not isinstance(stdout, ThreadOutput):
+        echo_to = getattr(stdout, "buffer", None)
+    if echo_to is not None:
+        stdout.flush()
+
+    log = open(log_path, "wb") if log_path is not None else None
+    tail = bytearray()
+    try:
+        with proc.stdout:
+            for chunk in iter(lambda: proc.stdout.read1(OUTPUT_TAIL_BYTES), b""):
+                if log is not None:
+                    log.write(chunk)
+                if echo_to is not None:
+                    echo_to.write(chunk)
+                    echo_to.flush()
+                tail += chunk
+                del tail[:-OUTPUT_TAIL_BYTES]
+    finally:
+        if log is not None:
+            log.close()
+
+    return proc.wait(), tail.decode(errors="replace")
+
+
+class Jobserver:
+    """GNU make jobserver pipe that lets concurrent builds share one job budget"""
+
+    def __init__(self, jobs: int):
+        self.jobs = jobs
+        self.read_fd, self.write_fd = os.pipe()
+        # Every client owns one implicit job slot, the pipe holds the rest
+        os.write(self.write_fd, b"+" * (jobs - 1))
+
+    @property
+    def fds(self) -> Tuple[int, int]:
+        """Descriptors a client process must inherit (see Popen's pass_fds)"""
+        return self.read_fd, self.write_fd
+
+    @property
+    def makeflags(self) -> str:
+        """MAKEFLAGS-style value pointing clients at this jobserver"""
+        # --jobserver-fds is the spelling older make and cargo understand
+        fds = f"{self.read_fd},{self.write_fd}"
+        return f"-j{self.jobs} --jobserver-fds={fds} --jobserver-auth={fds}"
+
+
+def remove_in_background(path: Path) -> None:
+    """Move path out of the way and delete it without waiting for the delete"""
+    # Removing a build tree (e.g. a cargo target/ dir) can take longer than
+    # the build's packaging step; renaming is instant and frees the name
+    doomed = path.with_name(f"{path.name}.doomed.{os.urandom(4).hex()}")
+    try:
+        os.rename(path, doomed)
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+
+    if shutil.which("rm"):
+        # rm -rf is much faster than rmtree on big trees and keeps running
+        # even if we exit first
+        subprocess.Popen(
+            ["rm", "-rf", str(doomed)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    else:
+        threading.Thread(
+            target=shutil.rmtree,
+            args=(doomed,),
+            kwargs={"ignore_errors": True},
+            daemon=True,
+        ).start()
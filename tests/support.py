@@ -0,0 +1,44 @@
+"""Shared test fixtures."""
+
+import os
+import subprocess
+from pathlib import Path
+
+# Keep the user's git config (signing, hooks, default branch) out of the tests
+GIT_ENV = {
+    **os.environ,
+    "GIT_CONFIG_GLOBAL": os.devnull,
+    "GIT_CONFIG_NOSYSTEM": "1",
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def git(*args: str) -> str:
+    """Run git with a clean config and return its stripped output"""
+    return subprocess.run(
+        ["git", *args], check=True, capture_output=True, text=True, env=GIT_ENV
+    ).stdout.strip()
+
+
+class UpstreamRepo:
+    """A throwaway upstream repository, reachable through a file:// URL"""
+
+    def __init__(self, root: Path):
+        self.path = root / "upstream"
+        # file:// rather than a plain path, so clones honour --depth and --filter
+        self.url = self.path.as_uri()
+        git("init", "-q", "-b", "main", str(self.path))
+
+    def commit(self, content: str) -> str:
+        """Commit content as README and return the new commit's hash"""
+        (self.path / "README").write_text(content)
+        git("-C", str(self.path), "add", "README")
+        git("-C", str(self.path), "commit", "-q", "-m", content)
+        return git("-C", str(self.path), "rev-parse", "HEAD")
+
+    def tag(self, name: str) -> None:
+        """Point tag name at HEAD, moving it if it already exists"""
+        git("-C", str(self.path), "tag", "-f", "-a", "-m", name, name)
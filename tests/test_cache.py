@@ -0,0 +1,93 @@
+"""Tests for the cache of built packages."""
+
+import contextlib
+import dataclasses
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from support import UpstreamRepo
+
+from slackware_pkg.cache import BuildCache
+from slackware_pkg.models import Package
+
+
+class BuildCacheKeyTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+        self.upstream = UpstreamRepo(self.root)
+        self.upstream.commit("first")
+        self.pkg = Package(
+            name="tool",
+            git_url=self.upstream.url,
+            tag="v1.0.0",
+            description="",
+            build_command="make",
+        )
+
+    def key(self, pkg: Optional[Package] = None, compresslevel: int = 9) -> str:
+        return BuildCache.key(pkg or self.pkg, self.upstream.path, compresslevel)
+
+    def test_same_inputs_same_key(self):
+        self.assertIsNotNone(self.key())
+        self.assertEqual(self.key(), self.key())
+
+    def test_key_changes_with_commit(self):
+        before = self.key()
+        self.upstream.commit("second")
+        self.assertNotEqual(self.key(), before)
+
+    def test_key_changes_with_build_command(self):
+        pkg = dataclasses.replace(self.pkg, build_command="make all")
+        self.assertNotEqual(self.key(pkg), self.key())
+
+    def test_key_changes_with_compresslevel(self):
+        self.assertNotEqual(self.key(compresslevel=1), self.key())
+
+    def test_no_key_outside_a_repository(self):
+        not_a_repo = self.root / "export"
+        not_a_repo.mkdir()
+        self.assertIsNone(BuildCache.key(self.pkg, not_a_repo, 9))
+
+
+class BuildCacheStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.cache = BuildCache(self.root / "cache")
+        self.output_file = self.root / "tool-1.0.0-x86_64-1.tgz"
+
+    def test_restore_miss(self):
+        self.assertFalse(self.cache.restore("missing", self.output_file))
+        self.assertFalse(self.output_file.exists())
+
+    def test_store_then_restore(self):
+        built = self.root / "built.tgz"
+        built.write_bytes(b"archive")
+        self.cache.store("key", built)
+
+        # The cache keeps its own copy, whatever happens to the original
+        built.write_bytes(b"rewritten")
+        self.assertTrue(self.cache.restore("key", self.output_file))
+        self.assertEqual(self.output_file.read_bytes(), b"archive")
+        self.assertEqual(list(self.root.glob("**/*.tmp")), [])
+
+    def test_store_failure_is_not_fatal(self):
+        (self.root / "cache").write_text("in the way")
+        built = self.root / "built.tgz"
+        built.write_bytes(b"archive")
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.cache.store("key", built)
+        self.assertIn("Could not cache", out.getvalue())
+        self.assertFalse(self.cache.restore("key", self.output_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests for config loading, its parse cache and the orjson speedup."""
+
+import contextlib
+import importlib
+import io
+import json
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from slackware_pkg import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONFIG = {
+    "output_path": "out",
+    "temp_path": "scratch",
+    "packages": [
+        {"name": "rg", "git_url": "https://example.com/rg", "tag": "v14.1.0"},
+        {"name": "fd", "git_url": "https://example.com/fd", "tag": "main"},
+    ],
+}
+
+
+class ConfigLoaderTestMixin:
+    """Tests run against whichever json_loads the reloaded module picked"""
+
+    blocked_modules: dict = {}
+
+    def setUp(self):
+        with mock.patch.dict(sys.modules, self.blocked_modules):
+            self.config = importlib.reload(config)
+        self.addCleanup(importlib.reload, config)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config_file = Path(tmp.name) / "config.json"
+
+    def load(self, text: str):
+        self.config_file.write_text(text)
+        loader = self.config.ConfigLoader(str(self.config_file))
+        with contextlib.redirect_stdout(io.StringIO()):
+            return loader, loader.load_packages()
+
+    def test_loads_packages_and_paths(self):
+        loader, packages = self.load(json.dumps(CONFIG))
+        self.assertEqual([pkg.name for pkg in packages], ["rg", "fd"])
+        self.assertEqual(loader.get("rg").version, "14.1.0")
+        self.assertEqual((loader.output_path, loader.temp_path), ("out", "scratch"))
+
+    def test_invalid_json_exits(self):
+        with self.assertRaises(SystemExit):
+            self.load("{not json")
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class OrjsonConfigLoaderTest(ConfigLoaderTestMixin, unittest.TestCase):
+    def test_uses_orjson(self):
+        self.assertIs(self.config.json_loads, orjson.loads)
+
+
+class StdlibConfigLoaderTest(ConfigLoaderTestMixin, unittest.TestCase):
+    blocked_modules = {"orjson": None}
+
+    def test_uses_stdlib_json(self):
+        self.assertIs(self.config.json_loads, json.loads)
+
+
+class ConfigCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config_file = Path(tmp.name) / "config.json"
+        self.write_config(CONFIG)
+
+    def write_config(self, data: dict) -> None:
+        self.config_file.write_text(json.dumps(data))
+
+    def load(self) -> list:
+        loader = config.ConfigLoader(str(self.config_file))
+        with contextlib.redirect_stdout(io.StringIO()):
+            return loader.load_packages()
+
+    def cache_files(self) -> list:
+        return sorted(self.config_file.parent.glob("config.json.cache.*.pkl"))
+
+    def test_second_load_hits_cache(self):
+        packages = self.load()
+        with mock.patch.object(config, "json_loads", side_effect=AssertionError):
+            self.assertEqual(self.load(), packages)
+
+    def test_changed_file_misses_and_drops_stale_cache(self):
+        self.load()
+        (stale,) = self.cache_files()
+
+        self.write_config({**CONFIG, "packages": CONFIG["packages"][:1]})
+        self.assertEqual([pkg.name for pkg in self.load()], ["rg"])
+
+        (current,) = self.cache_files()
+        self.assertNotEqual(current, stale)
+
+    def test_corrupt_cache_falls_back_to_json(self):
+        packages = self.load()
+        (cache_file,) = self.cache_files()
+        cache_file.write_bytes(b"not a pickle")
+
+        self.assertEqual(self.load(), packages)
+        # ...and the cache is rewritten for the next run
+        with open(cache_file, "rb") as f:
+            self.assertEqual(pickle.load(f)[2], packages)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for checkouts, cached and uncached."""
+
+import contextlib
+import io
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from support import UpstreamRepo, git
+
+from slackware_pkg import git as git_module
+from slackware_pkg.git import GitRepository
+from slackware_pkg.models import Package
+
+
+class GitCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.cache_root = self.root / "cache"
+        self.builds = 0
+
+        self.upstream = UpstreamRepo(self.root)
+        self.first = self.upstream.commit("first")
+        self.upstream.tag("v1.0.0")
+
+    def checkout(self, tag: str) -> str:
+        """Check out tag as a fresh build would, returning its commit"""
+        self.builds += 1
+        pkg = Package(name="tool", git_url=self.upstream.url, tag=tag, description="")
+        work_dir = self.root / f"build{self.builds}"
+        with contextlib.redirect_stdout(io.StringIO()):
+            repo_path = GitRepository.clone_or_update(pkg, work_dir, self.cache_root)
+        self.assertIsNotNone(repo_path)
+        return git("-C", str(repo_path), "rev-parse", "HEAD")
+
+    def cache_dir(self) -> str:
+        (cache_dir,) = self.cache_root.iterdir()
+        return str(cache_dir)
+
+    def test_cold_cache_clones_only_the_ref(self):
+        self.upstream.commit("second")
+        self.upstream.tag("v2.0.0")
+
+        self.assertEqual(self.checkout("v1.0.0"), self.first)
+        cache_dir = self.cache_dir()
+        self.assertEqual(
+            git("-C", cache_dir, "rev-parse", "--is-shallow-repository"), "true"
+        )
+        self.assertEqual(
+            git("-C", cache_dir, "for-each-ref", "--format=%(refname)"),
+            "refs/tags/v1.0.0",
+        )
+
+    def test_refresh_fetches_other_refs(self):
+        self.checkout("v1.0.0")
+        second = self.upstream.commit("second")
+        self.upstream.tag("v2.0.0")
+
+        self.assertEqual(self.checkout("v2.0.0"), second)
+        self.assertEqual(self.checkout("main"), second)
+
+    def test_moved_tag_is_refetched(self):
+        self.assertEqual(self.checkout("v1.0.0"), self.first)
+
+        # Rewritten upstream, like a nightly tag
+        moved = self.upstream.commit("second")
+        self.upstream.tag("v1.0.0")
+
+        self.assertEqual(self.checkout("v1.0.0"), moved)
+        self.assertEqual(self.checkout("main"), moved)
+
+    def test_broken_cache_is_recloned(self):
+        self.checkout("v1.0.0")
+        cache_dir = self.cache_dir()
+        git("-C", cache_dir, "remote", "set-url", "origin", str(self.root / "gone"))
+
+        self.assertEqual(self.checkout("v1.0.0"), self.first)
+        self.assertEqual(
+            git("-C", cache_dir, "remote", "get-url", "origin"), self.upstream.url
+        )
+
+
+class CloneTestMixin:
+    """Tests run against whichever way _clone ends up cloning"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+        self.upstream = UpstreamRepo(self.root)
+        self.first = self.upstream.commit("first")
+        self.upstream.tag("v1.0.0")
+        self.second = self.upstream.commit("second")
+
+    def clone(self, tag: str) -> str:
+        """Clone tag the way an uncached build falls back to, returning HEAD"""
+        dest = self.root / "clone"
+        with contextlib.redirect_stdout(io.StringIO()):
+            GitRepository._clone(self.upstream.url, tag, dest)
+        # Checked out, not just fetched
+        self.assertEqual(git("-C", str(dest), "status", "--porcelain"), "")
+        return git("-C", str(dest), "rev-parse", "HEAD")
+
+    def test_clones_tag(self):
+        self.assertEqual(self.clone("v1.0.0"), self.first)
+
+    def test_clones_branch(self):
+        self.assertEqual(self.clone("main"), self.second)
+
+    def test_unknown_ref_fails(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.clone("v9.9.9")
+
+
+@unittest.skipIf(git_module.pygit2 is None, "pygit2 is not installed")
+class Pygit2CloneTest(CloneTestMixin, unittest.TestCase):
+    def test_clones_without_git(self):
+        with mock.patch.object(GitRepository, "_run", side_effect=AssertionError):
+            self.assertEqual(self.clone("v1.0.0"), self.first)
+
+
+class GitCliCloneTest(CloneTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(git_module, "pygit2", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Tests for slack-desc generation."""
+
+import random
+import string
+import tempfile
+import unittest
+from pathlib import Path
+
+from slackware_pkg.models import Package
+from slackware_pkg.packager import SlackwarePackager
+
+
+def legacy_desc_lines(desc: str) -> list:
+    """The word-by-word wrapping loop create_slack_desc used to have"""
+    desc_lines = []
+    current_line = ""
+
+    for word in desc.split():
+        if len(current_line) + len(word) + 1 <= 60:
+            current_line += word + " "
+        else:
+            desc_lines.append(current_line.strip())
+            current_line = word + " "
+
+    if current_line:
+        desc_lines.append(current_line.strip())
+    return desc_lines
+
+
+def random_description(rng: random.Random) -> str:
+    """Description of random words, some longer than a whole line"""
+    words = [
+        "".join(rng.choices(string.ascii_letters + "-,.", k=rng.randint(1, 12)))
+        for _ in range(rng.randint(0, 120))
+    ]
+    if len(words) > 1 and rng.random() < 0.1:
+        # Never first: the old loop emitted a stray blank line for that
+        words.insert(rng.randint(1, len(words)), "x" * rng.randint(55, 70))
+    separators = [" ", "  ", "\n", "\t"]
+    return "".join(word + rng.choice(separators) for word in words)
+
+
+class SlackDescTest(unittest.TestCase):
+    def desc_lines(self, name: str, description: str) -> list:
+        pkg = Package(name=name, git_url="", tag="v1.0.0", description=description)
+        with tempfile.TemporaryDirectory() as tmp:
+            SlackwarePackager.create_slack_desc(pkg, Path(tmp))
+            text = (Path(tmp) / "install" / "slack-desc").read_text()
+        return text.splitlines()[8:]
+
+    def test_matches_legacy_wrapping(self):
+        rng = random.Random(1234)
+        for _ in range(2000):
+            description = random_description(rng)
+            expected = legacy_desc_lines(description)[:11]
+            expected += [""] * (11 - len(expected))
+            expected = [f"pkg: {line}" if line else "pkg:" for line in expected]
+            self.assertEqual(self.desc_lines("pkg", description), expected)
+
+    def test_exactly_eleven_lines(self):
+        self.assertEqual(self.desc_lines("pkg", ""), ["pkg:"] * 11)
+        self.assertEqual(len(self.desc_lines("pkg", "word " * 1000)), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests for release downloads with and without urllib3."""
+
+import contextlib
+import io
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from slackware_pkg import release
+from slackware_pkg.models import Package
+from slackware_pkg.release import ReleaseDownloader
+
+ASSET = "owner/tool/releases/download/v1.2.0/tool-1.2.0-linux64.tgz"
+PAYLOAD = bytes(range(256)) * 1024
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves the test directory, redirecting /moved/ to the real assets"""
+
+    def do_GET(self):
+        if self.path.startswith("/moved/"):
+            self.send_response(302)
+            self.send_header("Location", self.path[len("/moved") :])
+            self.end_headers()
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReleaseDownloaderTestMixin:
+    """Tests run against whichever client _fetch ends up using"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.serve_dir = tempfile.TemporaryDirectory()
+        asset = Path(cls.serve_dir.name) / ASSET
+        asset.parent.mkdir(parents=True)
+        asset.write_bytes(PAYLOAD)
+
+        handler = partial(QuietHandler, directory=cls.serve_dir.name)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.serve_dir.cleanup()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_dir = Path(tmp.name)
+
+    def download(self, path: str, tag: str = "v1.2.0"):
+        pkg = Package(
+            name="tool", git_url=f"{self.base_url}/{path}", tag=tag, description=""
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            return ReleaseDownloader.download_release(pkg, self.output_dir)
+
+    def test_downloads_asset(self):
+        output_file = self.download("owner/tool.git")
+        self.assertEqual(output_file, self.output_dir / "tool-1.2.0-x86_64-1.tgz")
+        self.assertEqual(output_file.read_bytes(), PAYLOAD)
+
+    def test_follows_redirects(self):
+        output_file = self.download("moved/owner/tool")
+        self.assertEqual(output_file.read_bytes(), PAYLOAD)
+
+    def test_missing_asset_leaves_no_file(self):
+        self.assertIsNone(self.download("owner/tool", tag="v9.9.9"))
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+
+@unittest.skipIf(release.urllib3 is None, "urllib3 is not installed")
+class Urllib3ReleaseDownloaderTest(ReleaseDownloaderTestMixin, unittest.TestCase):
+    def test_uses_pool(self):
+        self.download("owner/tool")
+        self.assertIsInstance(ReleaseDownloader._pool, release.urllib3.PoolManager)
+
+
+class UrlopenReleaseDownloaderTest(ReleaseDownloaderTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(release, "urllib3", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+if __name__ == "__main__":
+    unittest.main()